@@ -22,9 +22,12 @@ This is intentionally humorous; numbers are estimations for demonstration only.
 
 import streamlit as st
 from datetime import datetime
-import random
 import math
-import hashlib
+import itertools
+import zlib
+import time
+import functools
+from collections import deque
 
 # --------------------------
 # Improved emission factors (kg CO2e per USD spent)
@@ -62,22 +65,45 @@ DISTANCE_MULTIPLIERS = {
     "International (overseas)": 1.40,
 }
 
+# Shipping speed penalties (faster shipping means more emissions per order)
+_SHIP_SPEED = {
+    'Express / Overnight': 1.15,
+    'Two-day': 1.07,
+}
+
+# Selectbox options
+_CATEGORY_OPTIONS = tuple(EMISSION_FACTORS.keys())
+_DISTANCE_OPTIONS = tuple(DISTANCE_MULTIPLIERS.keys())
+_SHIP_SPEED_OPTIONS = ('Standard (5–8 days)', 'Two-day', 'Express / Overnight')
+
+# category factor * distance multiplier, precomputed for every pair
+_COMBINED = {
+    (cat, dist): EMISSION_FACTORS[cat] * DISTANCE_MULTIPLIERS[dist]
+    for cat in EMISSION_FACTORS
+    for dist in DISTANCE_MULTIPLIERS
+}
+
 # Constants for conversions
 KG_TO_TONNES = 1/1000
 CAR_KG_PER_KM = 0.192  # average car ~192 g CO2 per km -> 0.192 kg/km
 TREE_ABSORPTION_KG_PER_YEAR = 21.77  # approx. one mature tree absorbs ~21.77 kg CO2/year
 PHONE_CHARGE_KG = 0.000015  # very rough: kg CO2 equivalent per phone charge
 
+# Reciprocals so the comparisons below are multiplies
+_INV_CAR = 1.0 / CAR_KG_PER_KM
+_INV_TREE = 1.0 / TREE_ABSORPTION_KG_PER_YEAR
+_INV_PHONE = 1.0 / PHONE_CHARGE_KG
+
 # --------------------------
 # Expanded message templates and context-aware tips
-FEEDBACK_TEMPLATES = [
+FEEDBACK_TEMPLATES = (
     "Oh look — you bought {item}. The planet is so thrilled.",
     "Congrats on acquiring {item}! Earth will remember... briefly.",
     "Nice choice: {item}. Your carbon footprint applauds you silently.",
     "You ordered {item}. If guilt were measurable, it'd be in tonnes.",
     "One small purchase for you, one medium sigh from the atmosphere.",
     "You just added {item} to cart. The clouds sent a thank-you card (unsigned).",
-]
+)
 
 # Templated tips with conditions and placeholders for context
 TIPS_TEMPLATES = [
@@ -95,32 +121,52 @@ TIPS_TEMPLATES = [
     ({'categories': None}, "Check the brand's transparency reports — transparency often means better practices."),
 ]
 
+# Tips grouped by category so choose_tip is a single lookup
+_TIPS_BY_CATEGORY = {
+    cat: tuple(text for cond, text in TIPS_TEMPLATES if cond['categories'] is None or cat in cond['categories'])
+    for cat in EMISSION_FACTORS
+}
+_ALL_TIPS = tuple(text for _, text in TIPS_TEMPLATES)
+
 # Punchlines and short add-ons for variety
-PUNCHLINES = [
+PUNCHLINES = (
     "(Future you owes present you an explanation.)",
     "(Your carbon spreadsheet has been updated.)",
     "(Mood: fashionable, atmosphere: not so much.)",
     "(This tip brought to you with minimal irony.)",
     "(Do one small thing — then another tomorrow.)",
-]
+)
 
-SARCASTIC_SUFFIXES = [
+SARCASTIC_SUFFIXES = (
     "(Your carbon ledger has been updated.)",
     "(No refunds accepted from atmosphere.)",
     "(Sustainability: now available as an optional extra.)",
     "(Ask again in 5–10 business years.)",
     "(This message brought to you by fossil fuels.)",
-]
+)
+
+# Extra feedback line keyed by how bad the purchase is
+_INTENSITY_LINES = {
+    'mild': ("Barely a ripple.", "You could buy this daily and still be forgettable."),
+    'noticeable': ("A proper puff of CO2.", "You just made a small but measurable dent."),
+    'strong': ("That's the kind of purchase museums will catalog.", "Atmosphere: concerned."),
+    'epic': ("Monumental. The clouds sent flowers.", "You unlocked a carbon achievement: 'The Tower'."),
+}
 
 # --------------------------
 # Utility functions
 
+@functools.lru_cache(maxsize=1)
+def _minute_bucket(n):
+    # n is the epoch minute; a new minute is a new cache key, so this refreshes itself
+    return datetime.utcfromtimestamp(n * 60).strftime("%Y%m%d%H%M")
+
+
 def deterministic_seed(*parts):
     base = "|".join(map(str, parts))
-    h = hashlib.sha256()
-    minute = datetime.utcnow().strftime("%Y%m%d%H%M")
-    h.update((base + minute).encode("utf-8"))
-    return int(h.hexdigest(), 16) % (2**32)
+    minute = _minute_bucket(int(time.time()) // 60)
+    # not security-sensitive: crc32 is plenty for a reproducible 32-bit seed
+    return zlib.crc32((base + minute).encode("utf-8"))
 
 
 def format_kg(kg):
@@ -145,16 +191,14 @@ def estimate_emission(category: str, price_usd: float, quantity: int, distance_l
      - Add a shipping-speed penalty (express shipping has higher emissions per order)
      - If weight provided, add a weight-based transport term
     """
-    factor = EMISSION_FACTORS.get(category, EMISSION_FACTORS['Misc / Other'])
-    base = price_usd * factor * quantity
-    multiplier = DISTANCE_MULTIPLIERS.get(distance_level, 1.0)
-    result = base * multiplier
+    combined = _COMBINED.get((category, distance_level)) or (
+        EMISSION_FACTORS.get(category, EMISSION_FACTORS['Misc / Other'])
+        * DISTANCE_MULTIPLIERS.get(distance_level, 1.0)
+    )
+    result = price_usd * combined * quantity
 
     # shipping speed penalty
-    if shipping_speed == 'Express / Overnight':
-        result *= 1.15
-    elif shipping_speed == 'Two-day':
-        result *= 1.07
+    result *= _SHIP_SPEED.get(shipping_speed, 1.0)
 
     # weight influence (mild but sensible)
     if weight_kg and weight_kg > 0:
@@ -166,9 +210,10 @@ def estimate_emission(category: str, price_usd: float, quantity: int, distance_l
 # Message generation
 
 def choose_feedback(item_name, category, kg_co2, seed_val):
-    r = random.Random(seed_val)
-    tmpl = r.choice(FEEDBACK_TEMPLATES)
-    suffix = r.choice(SARCASTIC_SUFFIXES)
+    # pools are tiny, so each pick reads its own bit field of the seed instead of
+    # seeding a Random: bits 0-19 here, bits 20-31 in choose_tip
+    tmpl = FEEDBACK_TEMPLATES[(seed_val & 0xFF) % len(FEEDBACK_TEMPLATES)]
+    suffix = SARCASTIC_SUFFIXES[((seed_val >> 8) & 0xFF) % len(SARCASTIC_SUFFIXES)]
 
     # intensity
     if kg_co2 < 0.5:
@@ -180,33 +225,19 @@ def choose_feedback(item_name, category, kg_co2, seed_val):
     else:
         intensity = 'epic'
 
-    intensity_map = {
-        'mild': ["Barely a ripple.", "You could buy this daily and still be forgettable."],
-        'noticeable': ["A proper puff of CO2.", "You just made a small but measurable dent."],
-        'strong': ["That's the kind of purchase museums will catalog.", "Atmosphere: concerned."],
-        'epic': ["Monumental. The clouds sent flowers.", "You unlocked a carbon achievement: 'The Tower'."],
-    }
-
-    line = r.choice(intensity_map[intensity])
+    lines = _INTENSITY_LINES[intensity]
+    line = lines[((seed_val >> 16) & 0xF) % len(lines)]
     return f"{tmpl.format(item=item_name)} {line} {suffix}"
 
 
 def choose_tip(category, distance, weight_kg, shipping_speed, seed_val):
-    r = random.Random(seed_val + 7)
     # Find relevant templates
-    candidates = []
-    for cond, text in TIPS_TEMPLATES:
-        cats = cond.get('categories')
-        if cats is None or category in cats:
-            candidates.append(text)
-
-    if not candidates:
-        candidates = [t for _, t in TIPS_TEMPLATES]
+    candidates = _TIPS_BY_CATEGORY.get(category) or _ALL_TIPS
 
-    tip = r.choice(candidates)
+    tip = candidates[((seed_val >> 20) & 0x3F) % len(candidates)]
 
     # Fill placeholder
-    tip = tip.replace('{category}', category)
+    parts = [tip.replace('{category}', category)]
 
     # Add conditional suggestions
     extras = []
@@ -218,11 +249,11 @@ def choose_tip(category, distance, weight_kg, shipping_speed, seed_val):
         extras.append("Check if a local equivalent exists to avoid long-haul transport.")
 
     # Add a punchline to keep it fun
-    punch = r.choice(PUNCHLINES)
-    if extras:
-        tip = tip + ' ' + ' '.join(extras[:2])
+    punch = PUNCHLINES[(seed_val >> 26) % len(PUNCHLINES)]
+    parts.extend(extras[:2])
+    parts.append(punch)
 
-    return f"{tip} {punch}"
+    return ' '.join(parts)
 
 # --------------------------
 # Streamlit UI
@@ -236,14 +267,14 @@ with st.form(key='purchase_form'):
     with col1:
         item_name = st.text_input("Item name (e.g. 'AirPods Pro', 'Red T-shirt'):")
     with col2:
-        category = st.selectbox("Category", list(EMISSION_FACTORS.keys()))
+        category = st.selectbox("Category", _CATEGORY_OPTIONS)
 
     price = st.number_input("Price (USD)", min_value=0.0, value=49.99, step=1.0, format='%.2f')
     quantity = st.number_input("Quantity", min_value=1, value=1, step=1)
     weight = st.number_input("Approx weight (kg, optional, 0 if unknown)", min_value=0.0, value=0.0, step=0.1)
 
-    distance = st.selectbox("Shipping distance/scale", list(DISTANCE_MULTIPLIERS.keys()))
-    shipping_speed = st.selectbox("Shipping speed", ['Standard (5–8 days)', 'Two-day', 'Express / Overnight'])
+    distance = st.selectbox("Shipping distance/scale", _DISTANCE_OPTIONS)
+    shipping_speed = st.selectbox("Shipping speed", _SHIP_SPEED_OPTIONS)
     donate_offset = st.checkbox("Donate to offsets (I know it's a compromise)")
 
     submitted = st.form_submit_button("Calculate my guilt")
@@ -264,9 +295,9 @@ if submitted:
     st.markdown(f"**Category:** {category}  ")
     st.markdown(f"**Estimated emissions:** **{format_kg(kg_after)}** ({format_tonnes(kg_after)})")
 
-    car_km = kg_after / CAR_KG_PER_KM if CAR_KG_PER_KM > 0 else 0
-    tree_years = kg_after / TREE_ABSORPTION_KG_PER_YEAR
-    phone_charges = kg_after / PHONE_CHARGE_KG
+    car_km = kg_after * _INV_CAR
+    tree_years = kg_after * _INV_TREE
+    phone_charges = kg_after * _INV_PHONE
 
     st.write(f"Equivalent to driving ~{car_km:,.0f} km by car.")
     st.write(f"Equivalent to the CO2 absorbed by ~{tree_years:.1f} tree-years.")
@@ -281,9 +312,12 @@ if submitted:
     st.subheader("Sustainability tip (context-aware and varied)")
     st.success(tip)
 
-    if 'history' not in st.session_state:
-        st.session_state.history = []
-    st.session_state.history.insert(0, {
+    # bounded: only the most recent entries are ever shown
+    history = st.session_state.get('history')
+    if not isinstance(history, deque):
+        # sessions from before this change hold a newest-first list; keep its newest entries
+        st.session_state.history = deque(itertools.islice(history or (), 7), maxlen=7)
+    st.session_state.history.appendleft({
         'time': datetime.utcnow().isoformat() + 'Z',
         'item': item_name,
         'category': category,
@@ -294,7 +328,7 @@ if submitted:
 
     st.write('---')
     st.subheader('Recent calculations (this session)')
-    for h in st.session_state.history[:7]:
+    for h in st.session_state.history:
         st.write(f"• {h['time']}: {h['item'] or h['category']} — {h['kg_co2']} kg CO2e (${h['price']})")
 
     # Fixed unterminated string issue: use a properly closed string here